@@ -3,13 +3,18 @@ from data_sources.abstract import DataSource
 from data_sources.abstract import combine_data_sources, save_to_csv
 from data_sources.al2sync import AL2SyncDataSource
 from data_sources.beclever import BeCleverDataSource
+from data_sources.checkpoint import RunCheckpoint, CheckpointDataSource
 from data_sources.higyrus import HigyrusDataSource
+from data_sources.index import UserIndex
 
 __all__ = [
     'DataSource',
     'HigyrusDataSource',
     'BeCleverDataSource',
     'AL2SyncDataSource',
+    'CheckpointDataSource',
+    'RunCheckpoint',
+    'UserIndex',
     'combine_data_sources',
     'save_to_csv'
 ]
@@ -1,5 +1,6 @@
+import os
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Iterator, List
+from typing import Dict, Any, Iterator, List, Optional
 
 import pandas as pd
 
@@ -32,25 +33,70 @@ class DataSource(ABC):
         """
         pass
 
-    def to_dataframe(self) -> pd.DataFrame:
+    def provides_columns(self, columns: List[str]) -> bool:
+        """
+        Returns whether this source provides at least one of the given columns.
+
+        Every source provides "source", so asking for it keeps all the rows of every source.
+        """
+        return any(column in self.get_columns() for column in columns)
+
+    def iter_rows(self, columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterates over the data of this source, keeping only the requested columns.
+
+        The default implementation projects each row after it has been retrieved.
+        Sources able to restrict what they fetch should override it.
+
+        Args:
+            columns: Column names to keep. None keeps every column.
+        """
+        if columns is None:
+            yield from self
+            return
+
+        for row in self:
+            yield {column: value for column, value in row.items() if column in columns}
+
+    def to_dataframe(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Converts the data from this source to a pandas DataFrame.
-        
+
+        Args:
+            columns: Column names to keep. None keeps every column.
+
         Returns:
-            pd.DataFrame: A DataFrame containing all the data from this source.
+            pd.DataFrame: A DataFrame containing all the data from this source. When columns
+            are given, it holds the rows the source returns for them, or none at all if this
+            source provides none of the columns. Sources pushing the projection down may
+            return fewer rows than the full extract, e.g. when leaving out one-to-many joins.
         """
-        data = list(self)
+        if columns is None:
+            data = list(self)
+
+            if not data:
+                # Return an empty DataFrame with the correct columns
+                return pd.DataFrame(columns=self.get_columns())
+
+            return pd.DataFrame(data)
 
-        if not data:
-            # Return an empty DataFrame with the correct columns
-            return pd.DataFrame(columns=self.get_columns())
+        if not self.provides_columns(columns):
+            return pd.DataFrame()
 
-        return pd.DataFrame(data)
+        data = pd.DataFrame(list(self.iter_rows(columns)))
 
+        # Keep every row, even those holding none of the requested values
+        provided = [column for column in columns if column in data.columns or column in self.get_columns()]
 
-def combine_data_sources(sources: List[DataSource]) -> pd.DataFrame:
+        return data.reindex(columns=provided)
+
+
+def combine_data_sources(sources: List[DataSource], columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
     Combines data from multiple data sources into a single pandas DataFrame.
+
+    When columns are given, every source only retrieves those it provides and the
+    result keeps them in the requested order.
     """
     if not sources:
         return pd.DataFrame()
@@ -58,7 +104,7 @@ def combine_data_sources(sources: List[DataSource]) -> pd.DataFrame:
     combined_df = pd.DataFrame()
 
     for source in sources:
-        source_df = source.to_dataframe()
+        source_df = source.to_dataframe(columns)
 
         if combined_df.empty:
             combined_df = source_df
@@ -66,8 +112,14 @@ def combine_data_sources(sources: List[DataSource]) -> pd.DataFrame:
             # Otherwise, append the new data, filling missing columns with NaN
             combined_df = pd.concat([combined_df, source_df], ignore_index=True)
 
+    if columns is not None:
+        combined_df = combined_df[[column for column in columns if column in combined_df.columns]]
+
     return combined_df
 
 
 def save_to_csv(data: pd.DataFrame, filename: str) -> None:
-    data.to_csv(filename, index=False)
+    # Write to a temporary file first so a failed write never leaves a truncated CSV behind
+    tmp_filename = f"{filename}.tmp"
+    data.to_csv(tmp_filename, index=False)
+    os.replace(tmp_filename, filename)
@@ -6,6 +6,17 @@ from dotenv import load_dotenv
 from data_sources.abstract import DataSource
 
 
+# Output column -> SQL expression
+AL2SYNC_COLUMNS = {
+    "nombre": "s.NOMBRE",
+    "apellido": "s.APELLIDO",
+    "CUIT": "s.CUIT",
+    "email": "s.MAIL",
+    "created_at": "s.FECCRE",
+    "cooperativa": "c.NOMBRE",
+}
+
+
 class AL2SyncDBClient:
     """
     Client for connecting to the AL2Sync SQL Server database.
@@ -23,28 +34,43 @@ class AL2SyncDBClient:
         except ImportError:
             self._pyodbc = None
 
-    def query_users(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def build_query(columns: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Builds the users query selecting only the given columns.
+
+        Returns None when none of the columns come from AL2Sync and the source is not
+        requested either. The cooperatives join
+        is an inner join, so it always stays to keep the same set of rows.
+        """
+        selected = [column for column in AL2SYNC_COLUMNS if columns is None or column in columns]
+        if not selected:
+            if "source" not in columns:
+                return None
+            # Only the source is requested: select a key column to get one row per user, it is dropped afterwards
+            selected = ["CUIT"]
+
+        select_list = ",\n       ".join(f"{AL2SYNC_COLUMNS[column]} as {column}" for column in selected)
+
+        return (f"select {select_list}\n"
+                "from dbo.SOCIOS_AL2 s\n"
+                "         inner join dbo.COOPERATIVAS_AL2 C on s.COOPERATIVASID = C.ID;")
+
+    def query_users(self, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        query = self.build_query(columns)
+        if query is None:
+            return []
+
         conn = self._pyodbc.connect(self.db_conn_str)
         cursor = conn.cursor()
 
-        query = """
-                select s.NOMBRE   as nombre,
-                       s.APELLIDO as apellido,
-                       s.CUIT,
-                       s.MAIL     as email,
-                       s.FECCRE   as created_at,
-                       c.NOMBRE   as cooperativa
-                from dbo.SOCIOS_AL2 s
-                         inner join dbo.COOPERATIVAS_AL2 C on s.COOPERATIVASID = C.ID; \
-                """
-
         cursor.execute(query)
 
-        columns = [column[0] for column in cursor.description]
+        result_columns = [column[0] for column in cursor.description]
         results = []
 
         for row in cursor.fetchall():
-            user = {columns[i]: row[i] for i in range(len(columns))}
+            user = {result_columns[i]: row[i] for i in range(len(result_columns))}
             results.append(user)
 
         cursor.close()
@@ -61,23 +87,30 @@ class AL2SyncDataSource(DataSource):
     def __init__(self, client: Optional[AL2SyncDBClient] = None):
         self._client = client or AL2SyncDBClient()
         self._users = None
+        self._loaded_columns = None
 
     @property
     def name(self) -> str:
         return "AL2Sync"
 
-    def _ensure_data_loaded(self) -> None:
-        if self._users is None:
-            self._users = self._client.query_users()
+    def _ensure_data_loaded(self, columns: Optional[List[str]] = None) -> None:
+        if self._users is None or self._loaded_columns != columns:
+            self._users = self._client.query_users(columns)
+            self._loaded_columns = columns
 
     def __iter__(self) -> Iterator[Dict[str, Any]]:
-        self._ensure_data_loaded()
+        return self.iter_rows()
+
+    def iter_rows(self, columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        self._ensure_data_loaded(columns)
 
         for user in self._users:
-            user["source"] = self.name
+            # Drops the key column selected when only the source is requested
+            if columns is not None:
+                user = {column: value for column, value in user.items() if column in columns}
+            if columns is None or "source" in columns:
+                user["source"] = self.name
             yield user
 
     def get_columns(self) -> List[str]:
-        columns = ["nombre", "apellido", "CUIT", "email", "created_at", "cooperativa", "source"]
-
-        return columns
+        return list(AL2SYNC_COLUMNS) + ["source"]
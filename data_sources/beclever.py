@@ -6,6 +6,53 @@ from dotenv import load_dotenv
 from data_sources.abstract import DataSource
 
 
+# Output column -> (SQL expression, table aliases it needs)
+BECLEVER_COLUMNS = {
+    "nombre": ("C.Nom", ()),
+    "apellido": ("C.Ape + ' ' + C.Ape2", ()),
+    "numeroDocumento": ("C.NumDoc", ()),
+    "tipoPersona": ("IIF(C.IdTipoCliente = 1, 'PF', 'PJ')", ()),
+    "Movil": ("C.PreFijCel + C.TelCel", ()),
+    "email": ("C.Mai", ()),
+    "Movil2": ("C.TelCel2", ()),
+    "email2": ("C.Mai2", ()),
+    "created_at": ("C.FecAlt", ()),
+    "CUIT": ("C.NumDocFis", ()),
+    "pep": ("C.Pep", ()),
+    "nacionalidad": ("NAC.Des", ("NAC",)),
+    "altura": ("CADDR.Num", ("CADDR",)),
+    "codigoPostal": ("CADDR.CodPos", ("CADDR",)),
+    "calle": ("CADDR.Cal", ("CADDR",)),
+    "paisResidencia": ("COUNTRY.Des", ("CADDR", "COUNTRY")),
+    "provincia": ("PROV.Des", ("CADDR", "PROV")),
+    "numeroCuentaAL2": ("CT.IdCuenta", ()),
+    "AL2CVU": ("ACC.CVU", ("ACC",)),
+    "AL2Alias": ("ACC.Ali", ("ACC",)),
+    "nombreApoderadoAL2": ("CI.Nom + ' ' + CI.Nom2", ("CI",)),
+    "apellidoApoderadoAL2": ("CI.Ape + ' ' + CI.Ape2", ("CI",)),
+    "numeroDocumentoApoderadoAL2": ("CI.NumDoc", ("CI",)),
+    "CUITApoderadoAL2": ("CI.NumDocFis", ("CI",)),
+    "emailApoderadoAL2": ("CI.Mai", ("CI",)),
+    "MovilApoderadoAL2": ("CI.TelCel", ("CI",)),
+}
+
+# Joins in query order as (alias, clause). Left joins are only added when a selected
+# column needs them, CUENTAS is an inner join and always stays. CLIENTESDOMICILIO,
+# CUENTA_PRODUCTOS and CUENTAINTERVINIENTES may match several rows per account, so
+# leaving them out returns fewer rows: one per client account instead of one per
+# address, product and intervener.
+BECLEVER_JOINS = [
+    ("NAC", "left join Nacionalidades NAC on C.IdNacionalidad = NAC.IdNacionalidad"),
+    ("CADDR", "left join CLIENTESDOMICILIO CADDR\n"
+              "                   on C.IdCliente = CADDR.IdCliente and CADDR.IdTipoDomicilio = 1 -- Un cliente puede tener más de una dirección."),
+    ("COUNTRY", "left join PAISES COUNTRY on CADDR.IdPais = COUNTRY.IdPais"),
+    ("PROV", "left join PROVINCIAS PROV on CADDR.IdProvincia = PROV.IdProvincia"),
+    ("CT", "join CUENTAS CT on C.IdCliente = CT.IdCliente"),
+    ("ACC", "left join CUENTA_PRODUCTOS ACC on CT.IdCuenta = ACC.IdCuenta"),
+    ("CI", "left join CUENTAINTERVINIENTES CI on CT.IdCuenta = CI.IdCuenta"),
+]
+
+
 class BeCleverClient:
     """
     Client for connecting to the BeClever SQL Server database.
@@ -25,56 +72,44 @@ class BeCleverClient:
 
         print(f"BeCleverClient initialized with connection string")
 
-    def query_users(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def build_query(columns: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Builds the users query selecting only the given columns and the joins they need.
+
+        Returns None when none of the columns come from BeClever and the source is not requested either.
+        """
+        selected = [column for column in BECLEVER_COLUMNS if columns is None or column in columns]
+        if not selected:
+            if "source" not in columns:
+                return None
+            # Only the source is requested: select a key column to get one row per user, it is dropped afterwards
+            selected = ["CUIT"]
+
+        aliases = {"CT"}
+        for column in selected:
+            aliases.update(BECLEVER_COLUMNS[column][1])
+
+        select_list = ",\n       ".join(f"{BECLEVER_COLUMNS[column][0]} as {column}" for column in selected)
+        joins = "\n".join(f"         {clause}" for alias, clause in BECLEVER_JOINS if alias in aliases)
+
+        return f"select {select_list}\nfrom CLIENTES C\n{joins}\nORDER BY C.NumDocFis"
+
+    def query_users(self, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        query = self.build_query(columns)
+        if query is None:
+            return []
+
         conn = self._pyodbc.connect(self.db_conn_str)
         cursor = conn.cursor()
 
-        query = """
-                select C.Nom                                as nombre,
-                       C.Ape + ' ' + C.Ape2                 as apellido,
-                       C.NumDoc                             as numeroDocumento,
-                       IIF(C.IdTipoCliente = 1, 'PF', 'PJ') as tipoPersona,
-                       C.PreFijCel + C.TelCel               as Movil,
-                       C.Mai                                as email,
-                       C.TelCel2                            as Movil2,
-                       C.Mai2                               as email2,
-                       C.FecAlt                             as created_at,
-                       C.NumDocFis                          as CUIT,
-                       C.Pep                                as pep,
-                       NAC.Des                              as nacionalidad,
-                       CADDR.Num                            as altura,
-                       CADDR.CodPos                         as codigoPostal,
-                       CADDR.Cal                            as calle,
-                       COUNTRY.Des                          as paisResidencia,
-                       PROV.Des                             as provincia,
-                       CT.IdCuenta                          as numeroCuentaAL2,
-                       ACC.CVU                              as AL2CVU,
-                       ACC.Ali                              as AL2Alias,
-                       CI.Nom + ' ' + CI.Nom2               as nombreApoderadoAL2,
-                       CI.Ape + ' ' + CI.Ape2               as apellidoApoderadoAL2,
-                       CI.NumDoc                            as numeroDocumentoApoderadoAL2,
-                       CI.NumDocFis                         as CUITApoderadoAL2,
-                       CI.Mai                               as emailApoderadoAL2,
-                       CI.TelCel                            as MovilApoderadoAL2
-                from CLIENTES C
-                         left join Nacionalidades NAC on C.IdNacionalidad = NAC.IdNacionalidad
-                         left join CLIENTESDOMICILIO CADDR
-                                   on C.IdCliente = CADDR.IdCliente and CADDR.IdTipoDomicilio = 1 -- Un cliente puede tener más de una dirección. 
-                         left join PAISES COUNTRY on CADDR.IdPais = COUNTRY.IdPais
-                         left join PROVINCIAS PROV on CADDR.IdProvincia = PROV.IdProvincia
-                         join CUENTAS CT on C.IdCliente = CT.IdCliente
-                         left join CUENTA_PRODUCTOS ACC on CT.IdCuenta = ACC.IdCuenta
-                         left join CUENTAINTERVINIENTES CI on CT.IdCuenta = CI.IdCuenta
-                ORDER BY C.NumDocFis
-                """
-
         cursor.execute(query)
 
-        columns = [column[0] for column in cursor.description]
+        result_columns = [column[0] for column in cursor.description]
         results = []
 
         for row in cursor.fetchall():
-            user = {columns[i]: row[i] for i in range(len(columns))}
+            user = {result_columns[i]: row[i] for i in range(len(result_columns))}
             results.append(user)
 
         cursor.close()
@@ -88,53 +123,30 @@ class BeCleverDataSource(DataSource):
     def __init__(self, client: Optional[BeCleverClient] = None):
         self._client = client or BeCleverClient()
         self._users = None
+        self._loaded_columns = None
 
     @property
     def name(self) -> str:
         return "BeClever"
 
-    def _ensure_data_loaded(self) -> None:
-        if self._users is None:
-            self._users = self._client.query_users()
+    def _ensure_data_loaded(self, columns: Optional[List[str]] = None) -> None:
+        if self._users is None or self._loaded_columns != columns:
+            self._users = self._client.query_users(columns)
+            self._loaded_columns = columns
 
     def __iter__(self) -> Iterator[Dict[str, Any]]:
-        self._ensure_data_loaded()
+        return self.iter_rows()
+
+    def iter_rows(self, columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        self._ensure_data_loaded(columns)
 
         for user in self._users:
+            # Drops the key column selected when only the source is requested
+            user_data = {column: value for column, value in user.items() if columns is None or column in columns}
             # Add source identifier
-            user_data = user.copy()
-            user_data["source"] = self.name
+            if columns is None or "source" in columns:
+                user_data["source"] = self.name
             yield user_data
 
     def get_columns(self) -> List[str]:
-        columns = [
-            "nombre",
-            "apellido",
-            "numeroDocumento",
-            "tipoPersona",
-            "Movil",
-            "email",
-            "Movil2",
-            "email2",
-            "created_at",
-            "CUIT",
-            "pep",
-            "nacionalidad",
-            "altura",
-            "codigoPostal",
-            "calle",
-            "paisResidencia",
-            "provincia",
-            "numeroCuentaAL2",
-            "AL2CVU",
-            "AL2Alias",
-            "nombreApoderadoAL2",
-            "apellidoApoderadoAL2",
-            "numeroDocumentoApoderadoAL2",
-            "CUITApoderadoAL2",
-            "emailApoderadoAL2",
-            "MovilApoderadoAL2",
-            "source"
-        ]
-
-        return columns
+        return list(BECLEVER_COLUMNS) + ["source"]
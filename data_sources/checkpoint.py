@@ -0,0 +1,183 @@
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Callable
+
+import pandas as pd
+
+from data_sources.abstract import DataSource
+
+
+class CheckpointDataSource(DataSource):
+    """
+    Data source implementation that serves a source extract stored in a run checkpoint.
+    """
+
+    def __init__(self, name: str, data: pd.DataFrame):
+        self._name = name
+        self._data = data
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        yield from self._data.to_dict("records")
+
+    def get_columns(self) -> List[str]:
+        return list(self._data.columns)
+
+    def to_dataframe(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        # Copies, so callers changing the result do not alter the checkpoint data
+        if columns is None:
+            return self._data.copy()
+
+        return self._data[[column for column in columns if column in self._data.columns]].copy()
+
+
+class RunCheckpoint:
+    """
+    Persists the progress of a run in a local directory so a failed run can be resumed.
+
+    Every completed source extract is stored in the run directory along with a manifest
+    describing the run. Files are first written to a temporary file and then moved in
+    place, so a crash never leaves a half written checkpoint behind. Once the run is
+    completed the extracts are deleted and only the manifest is kept. Runs are removed
+    altogether by remove_expired once they have not been updated for some days.
+    """
+
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, run_dir: str, manifest: Dict[str, Any]):
+        self.run_dir = run_dir
+        self._manifest = manifest
+
+    @classmethod
+    def create(cls, runs_dir: str = "runs", columns: Optional[List[str]] = None) -> "RunCheckpoint":
+        run_id = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        run_dir = os.path.join(runs_dir, run_id)
+        os.makedirs(run_dir)
+
+        manifest = {
+            "run_id": run_id,
+            "created_at": datetime.now().isoformat(),
+            "columns": columns,
+            "sources": {},
+            "output": None
+        }
+
+        checkpoint = cls(run_dir, manifest)
+        checkpoint._write_manifest()
+
+        return checkpoint
+
+    @classmethod
+    def exists(cls, run_id: str, runs_dir: str = "runs") -> bool:
+        return os.path.exists(os.path.join(runs_dir, run_id, cls.MANIFEST_FILE))
+
+    @classmethod
+    def remove_expired(cls, runs_dir: str = "runs", keep_days: int = 7, keep_run_id: Optional[str] = None) -> None:
+        """
+        Removes the runs, completed or not, whose manifest was last updated more than keep_days ago.
+        """
+        if not os.path.isdir(runs_dir):
+            return
+
+        expires_before = time.time() - keep_days * 24 * 60 * 60
+
+        for run_id in os.listdir(runs_dir):
+            manifest_path = os.path.join(runs_dir, run_id, cls.MANIFEST_FILE)
+            if run_id == keep_run_id or not os.path.exists(manifest_path):
+                continue
+
+            if os.path.getmtime(manifest_path) < expires_before:
+                print(f"Removing expired run {run_id}")
+                shutil.rmtree(os.path.join(runs_dir, run_id))
+
+    @classmethod
+    def resume(cls, run_id: str, runs_dir: str = "runs") -> "RunCheckpoint":
+        run_dir = os.path.join(runs_dir, run_id)
+        manifest_path = os.path.join(run_dir, cls.MANIFEST_FILE)
+
+        if not cls.exists(run_id, runs_dir):
+            raise ValueError(f"No checkpoint found for run {run_id} in {runs_dir}")
+
+        with open(manifest_path, encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+
+        return cls(run_dir, manifest)
+
+    @property
+    def run_id(self) -> str:
+        return self._manifest["run_id"]
+
+    @property
+    def columns(self) -> Optional[List[str]]:
+        return self._manifest["columns"]
+
+    @property
+    def is_completed(self) -> bool:
+        return self._manifest["output"] is not None
+
+    def is_source_done(self, name: str) -> bool:
+        source = self._manifest["sources"].get(name, {})
+        if source.get("status") != "done" or not source.get("file"):
+            return False
+
+        # A missing extract has to be extracted again
+        return os.path.exists(os.path.join(self.run_dir, source["file"]))
+
+    def save_source(self, name: str, data: pd.DataFrame) -> None:
+        filename = f"{name}.pkl"
+        self._atomic_write(filename, lambda path: data.to_pickle(path))
+
+        self._manifest["sources"][name] = {
+            "status": "done",
+            "file": filename,
+            "rows": len(data),
+            "finished_at": datetime.now().isoformat()
+        }
+        self._write_manifest()
+
+    def load_source(self, name: str) -> CheckpointDataSource:
+        filename = self._manifest["sources"][name]["file"]
+
+        return CheckpointDataSource(name, pd.read_pickle(os.path.join(self.run_dir, filename)))
+
+    def mark_source_failed(self, name: str, error: Exception) -> None:
+        self._manifest["sources"][name] = {
+            "status": "failed",
+            "error": str(error),
+            "finished_at": datetime.now().isoformat()
+        }
+        self._write_manifest()
+
+    def mark_completed(self, output_file: str) -> None:
+        self._manifest["output"] = {
+            "file": output_file,
+            "finished_at": datetime.now().isoformat()
+        }
+
+        # The extracts hold personal data and are no longer needed once the output is written
+        for source in self._manifest["sources"].values():
+            filename = source.pop("file", None)
+            if filename and os.path.exists(os.path.join(self.run_dir, filename)):
+                os.remove(os.path.join(self.run_dir, filename))
+
+        self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        def write(path: str) -> None:
+            with open(path, "w", encoding="utf-8") as manifest_file:
+                json.dump(self._manifest, manifest_file, indent=2)
+
+        self._atomic_write(self.MANIFEST_FILE, write)
+
+    def _atomic_write(self, filename: str, write: Callable[[str], None]) -> None:
+        path = os.path.join(self.run_dir, filename)
+        tmp_path = f"{path}.tmp"
+
+        write(tmp_path)
+        os.replace(tmp_path, path)
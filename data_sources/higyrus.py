@@ -1,4 +1,5 @@
 import os
+import re
 from typing import Dict, Any, Optional, List, Iterator
 
 import requests
@@ -255,25 +256,36 @@ class HigyrusDataSource(DataSource):
             self._persons = self._client.list_persons()
 
     def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_rows()
+
+    def iter_rows(self, columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
         self._ensure_data_loaded()
 
         for person in self._persons:
-            yield self._person_to_dict(person)
+            yield self._person_to_dict(person, columns)
 
-    def _person_to_dict(self, person: Person) -> Dict[str, Any]:
+    def _person_to_dict(self, person: Person, columns: Optional[List[str]] = None) -> Dict[str, Any]:
         data = {}
 
+        def wanted(column_name: str) -> bool:
+            return columns is None or column_name in columns
+
         if person.datosPrincipalesFisicas:
-            data["nombre"] = getattr(person.datosPrincipalesFisicas, "nombres", None)
-            data["apellido"] = getattr(person.datosPrincipalesFisicas, "apellidos", None)
-            data["tipoDocumento"] = getattr(person.datosPrincipalesFisicas, "tipoId", None)
-            data["numeroDocumento"] = getattr(person.datosPrincipalesFisicas, "id", None)
+            if wanted("nombre"):
+                data["nombre"] = getattr(person.datosPrincipalesFisicas, "nombres", None)
+            if wanted("apellido"):
+                data["apellido"] = getattr(person.datosPrincipalesFisicas, "apellidos", None)
+            if wanted("tipoDocumento"):
+                data["tipoDocumento"] = getattr(person.datosPrincipalesFisicas, "tipoId", None)
+            if wanted("numeroDocumento"):
+                data["numeroDocumento"] = getattr(person.datosPrincipalesFisicas, "id", None)
 
         if person.datosPersonales:
             for field_name in person.datosPersonales.model_fields.keys():
-                data[field_name] = getattr(person.datosPersonales, field_name, None)
+                if wanted(field_name):
+                    data[field_name] = getattr(person.datosPersonales, field_name, None)
 
-        if person.datosFiscalesNacionales:
+        if person.datosFiscalesNacionales and wanted("CUIT"):
             data["CUIT"] = getattr(person.datosFiscalesNacionales, "CUIT", None)
 
         # maps "tipoMedio" value as a column, and "medio" as a value plus some normalization to minimize column names explosion
@@ -297,23 +309,28 @@ class HigyrusDataSource(DataSource):
                         medio_counts[tipo] = 1
                         column_name = tipo
 
-                    data[column_name] = getattr(medio, "medio", None)
+                    if wanted(column_name):
+                        data[column_name] = getattr(medio, "medio", None)
 
         # Only include address when "Real" (ignoring Legal)
-        if person.domiciliosSimples:
+        address_columns = [column for column in ("pais", "provincia", "calle", "altura", "codigoPostal")
+                           if wanted(column)]
+        if person.domiciliosSimples and address_columns:
             for domicilio in person.domiciliosSimples:
                 if getattr(domicilio, "uso", "") == "Real":
-                    data["pais"] = getattr(domicilio, "pais", None)
-                    data["provincia"] = getattr(domicilio, "provincia", None)
-                    data["calle"] = getattr(domicilio, "calle", None)
-                    data["altura"] = getattr(domicilio, "altura", None)
-                    data["codigoPostal"] = getattr(domicilio, "codigoPostal", None)
+                    for column in address_columns:
+                        data[column] = getattr(domicilio, column, None)
                     break
 
-        data["source"] = self.name
+        if wanted("source"):
+            data["source"] = self.name
 
         return data
 
+    def provides_columns(self, columns: List[str]) -> bool:
+        # Repeated mediosComuniacion add an ordinal to the column name, e.g. email2
+        return super().provides_columns([re.sub(r"\d+$", "", column) for column in columns])
+
     def get_columns(self) -> List[str]:
         columns = [
             # From datosPrincipalesFisicas
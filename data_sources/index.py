@@ -0,0 +1,102 @@
+import re
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+
+def _normalize_key(key: str, value: Any) -> Optional[str]:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+
+    # Numeric identifiers may come back as floats once pandas mixes them with NaN
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+
+    value = str(value).strip()
+
+    if key == "email":
+        return value.lower() or None
+
+    if key == "documento":
+        # Documents may hold letters (e.g. passports), so only separators are ignored: 12.345.678 == 12345678
+        return re.sub(r"[\s.\-/]", "", value).upper() or None
+
+    # CUITs are compared by their digits only, e.g. 20-12345678-9 == 20123456789
+    return re.sub(r"\D", "", value) or None
+
+
+def _user_key(record: Dict[str, Any]) -> Optional[tuple]:
+    cuit = _normalize_key("cuit", record.get("CUIT"))
+    if cuit is not None:
+        return record.get("source"), "cuit", cuit
+
+    documento = _normalize_key("documento", record.get("numeroDocumento"))
+    if documento is not None:
+        return record.get("source"), "documento", record.get("tipoDocumento"), documento
+
+    return None
+
+
+class UserIndex:
+    """
+    Immutable snapshot of the combined users with hash indexes for point lookups.
+
+    Each lookup key maps to the columns it is indexed on. A user record shows up once
+    per lookup even when several of those columns hold the same value.
+
+    Users are deduplicated per source on their CUIT, or their document when they have
+    no CUIT, keeping the first record. Records with neither are only merged when they
+    are identical.
+    """
+
+    INDEXED_COLUMNS = {
+        "cuit": ["CUIT"],
+        "documento": ["numeroDocumento"],
+        "email": ["email", "email2"]
+    }
+
+    def __init__(self, data: pd.DataFrame):
+        data = data.drop_duplicates()
+
+        self.built_at = datetime.now()
+        self._records = []
+
+        seen_users = set()
+        for record in data.astype(object).where(data.notna(), None).to_dict("records"):
+            user_key = _user_key(record)
+            if user_key is not None:
+                if user_key in seen_users:
+                    continue
+                seen_users.add(user_key)
+            self._records.append(record)
+
+        self._indexes = {key: {} for key in self.INDEXED_COLUMNS}
+
+        for position, record in enumerate(self._records):
+            for key, columns in self.INDEXED_COLUMNS.items():
+                for column in columns:
+                    value = _normalize_key(key, record.get(column))
+                    if value is None:
+                        continue
+
+                    positions = self._indexes[key].setdefault(value, [])
+                    if not positions or positions[-1] != position:
+                        positions.append(position)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def lookup(self, key: str, value: Any) -> List[Dict[str, Any]]:
+        """
+        Returns the user records whose indexed columns match the given value.
+
+        Raises:
+            ValueError: If the key is not one of INDEXED_COLUMNS.
+        """
+        if key not in self._indexes:
+            raise ValueError(f"Unknown lookup key '{key}'. Valid keys are: {', '.join(self.INDEXED_COLUMNS)}")
+
+        positions = self._indexes[key].get(_normalize_key(key, value), [])
+
+        return [self._records[position] for position in positions]
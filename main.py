@@ -1,11 +1,14 @@
-from data_sources import HigyrusDataSource, BeCleverDataSource, AL2SyncDataSource, combine_data_sources, \
-    save_to_csv
+import argparse
+import sys
 
+from data_sources import HigyrusDataSource, BeCleverDataSource, AL2SyncDataSource, RunCheckpoint, \
+    combine_data_sources, save_to_csv
 
-def consume_data_source(data_source):
+
+def consume_data_source(data_source, columns=None):
     print(f"\nConsuming {data_source.name} data source:")
 
-    result = data_source.to_dataframe()
+    result = data_source.to_dataframe(columns)
 
     print(f"Converted to DataFrame with {len(result)} rows and {len(result.columns)} columns")
 
@@ -16,30 +19,84 @@ def consume_data_source(data_source):
     return result
 
 
+def parse_args(data_sources):
+    parser = argparse.ArgumentParser(description="Generates a CSV file with the users from all data sources.")
+    parser.add_argument("--columns",
+                        help="Comma separated list of columns to export, e.g. CUIT,numeroDocumento,email,source. "
+                             "Only these columns are retrieved from the data sources. Defaults to all columns.")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Resumes a previous run, skipping the data sources it already extracted.")
+    parser.add_argument("--runs-dir", default="runs",
+                        help="Directory where run checkpoints are stored. Defaults to 'runs'.")
+    parser.add_argument("--keep-days", type=int, default=7,
+                        help="Days to keep the checkpoints of previous runs, completed or not. Defaults to 7.")
+
+    args = parser.parse_args()
+    if args.columns:
+        args.columns = [column.strip() for column in args.columns.split(",") if column.strip()]
+        unknown = [column for column in args.columns
+                   if not any(data_source.provides_columns([column]) for data_source in data_sources)]
+        if unknown:
+            parser.error(f"Unknown columns: {', '.join(unknown)}")
+    if args.resume and args.columns:
+        parser.error("--columns cannot be used with --resume, the resumed run keeps its own columns")
+    if args.resume and not RunCheckpoint.exists(args.resume, args.runs_dir):
+        parser.error(f"No checkpoint found for run {args.resume} in {args.runs_dir}")
+    if args.resume and RunCheckpoint.resume(args.resume, args.runs_dir).is_completed:
+        parser.error(f"Run {args.resume} already completed, there is nothing to resume")
+    if args.keep_days < 0:
+        parser.error("--keep-days cannot be negative")
+
+    return args
+
+
 def main():
     data_sources = [HigyrusDataSource(), BeCleverDataSource(), AL2SyncDataSource()]
+    args = parse_args(data_sources)
+
+    RunCheckpoint.remove_expired(args.runs_dir, args.keep_days, keep_run_id=args.resume)
+
+    if args.resume:
+        checkpoint = RunCheckpoint.resume(args.resume, args.runs_dir)
+        print(f"Resuming run {checkpoint.run_id} from {checkpoint.run_dir}")
+    else:
+        checkpoint = RunCheckpoint.create(args.runs_dir, args.columns)
+        print(f"Starting run {checkpoint.run_id}, resume it with --resume {checkpoint.run_id} if it fails")
+
+    columns = checkpoint.columns
 
     successful_sources = []
     results = []
 
     for data_source in data_sources:
+        if checkpoint.is_source_done(data_source.name):
+            print(f"\nLoading {data_source.name} data source from checkpoint...")
+            successful_sources.append(checkpoint.load_source(data_source.name))
+            continue
+
         try:
             print(f"\nProcessing {data_source.name} data source...")
-            result = consume_data_source(data_source)
+            result = consume_data_source(data_source, columns)
+            checkpoint.save_source(data_source.name, result)
             results.append(result)
             successful_sources.append(data_source)
             print(f"Successfully processed {data_source.name} data source")
         except Exception as e:
+            checkpoint.mark_source_failed(data_source.name, e)
             print(f"ERROR: Failed to process {data_source.name} data source")
             print(f"Error details: {str(e)}")
             print(f"Skipping {data_source.name} and continuing with next data source")
 
+    failed_sources = [data_source.name for data_source in data_sources
+                      if not checkpoint.is_source_done(data_source.name)]
+
     if not successful_sources:
         print("\nNo data sources were processed successfully. Cannot generate output.")
-        return
+        print(f"Resume the run with --resume {checkpoint.run_id}")
+        sys.exit(1)
 
     print("\nCombining data from all successful sources...")
-    combined_result = combine_data_sources(successful_sources)
+    combined_result = combine_data_sources(successful_sources, columns)
 
     print(f"Combined DataFrame has {len(combined_result)} rows and {len(combined_result.columns)} columns")
     print("First few rows of combined data:")
@@ -50,6 +107,14 @@ def main():
     save_to_csv(combined_result, output_file)
     print(f"Data saved to {output_file}")
 
+    if failed_sources:
+        # Keep the checkpoint so a resumed run only extracts the failed data sources
+        print(f"\nWARNING: {output_file} is missing the data from {', '.join(failed_sources)}")
+        print(f"Resume the run with --resume {checkpoint.run_id}")
+        sys.exit(1)
+
+    checkpoint.mark_completed(output_file)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from typing import Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+
+from data_sources import HigyrusDataSource, BeCleverDataSource, AL2SyncDataSource, UserIndex
+
+
+class UserService:
+    """
+    Keeps the combined users in memory and refreshes them from the data sources.
+
+    Lookups are served from an immutable UserIndex snapshot. A refresh builds a new
+    snapshot aside and swaps it in once ready, so lookups keep using the previous one
+    meanwhile. A data source failing during a refresh keeps its previous extract.
+    """
+
+    def __init__(self):
+        self._index = UserIndex(pd.DataFrame())
+        self._extracts = {}
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def index(self) -> UserIndex:
+        return self._index
+
+    def refresh(self) -> None:
+        with self._refresh_lock:
+            # Data sources cache their data, so every refresh needs new instances
+            for data_source in [HigyrusDataSource(), BeCleverDataSource(), AL2SyncDataSource()]:
+                try:
+                    print(f"Refreshing {data_source.name} data source...")
+                    self._extracts[data_source.name] = data_source.to_dataframe()
+                except Exception as e:
+                    print(f"ERROR: Failed to refresh {data_source.name} data source, keeping previous data")
+                    print(f"Error details: {str(e)}")
+
+            combined = pd.concat(self._extracts.values(), ignore_index=True) if self._extracts else pd.DataFrame()
+            self._index = UserIndex(combined)
+
+            print(f"Users index refreshed with {len(self._index)} users")
+
+    def run_scheduler(self, interval: int, stop_event: threading.Event) -> None:
+        while not stop_event.wait(interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print("ERROR: Scheduled refresh failed, keeping previous data")
+                print(f"Error details: {str(e)}")
+
+
+class UserRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves user lookups as JSON:
+
+    - GET /users?cuit=<CUIT>, /users?documento=<number> or /users?email=<email>
+    - GET /health
+    """
+
+    service: Optional[UserService] = None
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        index = self.service.index
+
+        if url.path == "/health":
+            self._send_json(200, {"users": len(index), "refreshed_at": index.built_at.isoformat()})
+            return
+
+        if url.path != "/users":
+            self._send_json(404, {"error": f"Unknown path {url.path}"})
+            return
+
+        params = parse_qs(url.query)
+        if len(params) != 1:
+            self._send_json(400, {"error": f"Expected one of: {', '.join(UserIndex.INDEXED_COLUMNS)}"})
+            return
+
+        key, values = next(iter(params.items()))
+        try:
+            self._send_json(200, {"results": index.lookup(key, values[0])})
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+
+    def _send_json(self, status: int, body: dict) -> None:
+        payload = json.dumps(body, default=str).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else "unix-socket"
+
+
+MIN_REFRESH_INTERVAL = 60
+
+
+def _is_socket_in_use(path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(path)
+        except ConnectionRefusedError:
+            return False
+
+    return True
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serves user lookups from an in-memory index refreshed on a schedule.")
+    parser.add_argument("--interval", type=int, default=3600,
+                        help=f"Seconds between refreshes of the data sources, at least {MIN_REFRESH_INTERVAL}. "
+                             "Defaults to 3600.")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to listen on. Defaults to 127.0.0.1.")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on. Defaults to 8080.")
+    parser.add_argument("--socket", help="Unix socket path to listen on instead of host and port.")
+
+    args = parser.parse_args()
+    if args.interval < MIN_REFRESH_INTERVAL:
+        parser.error(f"--interval must be at least {MIN_REFRESH_INTERVAL} seconds")
+    if args.socket and os.path.exists(args.socket):
+        if not stat.S_ISSOCK(os.stat(args.socket).st_mode):
+            parser.error(f"--socket path {args.socket} already exists and is not a socket")
+        if _is_socket_in_use(args.socket):
+            parser.error(f"--socket path {args.socket} is in use by another running service")
+
+    return args
+
+
+def main():
+    args = parse_args()
+
+    service = UserService()
+    print("Loading users from all data sources...")
+    service.refresh()
+
+    stop_event = threading.Event()
+    threading.Thread(target=service.run_scheduler, args=(args.interval, stop_event), daemon=True).start()
+
+    UserRequestHandler.service = service
+    if args.socket:
+        # Removes the stale socket left behind by a previous instance that did not shut down cleanly
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        server = ThreadingUnixHTTPServer(args.socket, UserRequestHandler)
+        print(f"Serving user lookups on unix socket {args.socket}")
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), UserRequestHandler)
+        print(f"Serving user lookups on http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        stop_event.set()
+        server.server_close()
+        if args.socket and os.path.exists(args.socket) and stat.S_ISSOCK(os.stat(args.socket).st_mode):
+            os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()